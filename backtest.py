@@ -2,25 +2,57 @@
 
 Usage example:
     python backtest.py --symbols BTC,ETH --limit 300
+    python backtest.py --symbols BTC,ETH --format ndjson              # 트레이드를 생성 즉시 한 줄씩 출력
+    python backtest.py --symbols BTC,ETH --summary-only               # 트레이드 상세 없이 요약만
+    python backtest.py --symbols BTC,ETH --trade-log trades.bin       # 트레이드를 바이너리 로그로 기록
 """
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from core.backtester import Backtester
+from core.output import NDJSONWriter, TradeLogWriter
 
 def parse_args():
     p = argparse.ArgumentParser(description="Run historical backtest")
     p.add_argument("--symbols", type=str, default="BTC,ETH", help="Comma separated symbols")
     p.add_argument("--limit", type=int, default=500, help="Max candles per symbol")
+    p.add_argument("--format", choices=["json", "ndjson"], default="json", help="Output format")
+    p.add_argument("--summary-only", action="store_true", help="Skip per-trade output")
+    p.add_argument("--trade-log", type=str, default=None, help="Write trades to a binary trade log file")
     return p.parse_args()
 
 def main():
     args = parse_args()
     symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
     bt = Backtester()
-    result = bt.run(symbols, limit=args.limit)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    sinks = []
+    log_file = None
+    if args.trade_log:
+        log_file = open(args.trade_log, "wb")
+        sinks.append(TradeLogWriter(log_file).write)
+    writer = NDJSONWriter(sys.stdout) if args.format == "ndjson" else None
+    if writer is not None and not args.summary_only:
+        sinks.append(lambda t: writer.write({"type": "trade", **t}))
+
+    def on_trade(trade):
+        for sink in sinks:
+            sink(trade)
+
+    # json 포맷은 기존과 동일하게 트레이드를 결과에 포함 (요약 전용/스트리밍 시에는 보관하지 않음)
+    keep_trades = writer is None and not args.summary_only
+    try:
+        result = bt.run(symbols, limit=args.limit, on_trade=on_trade if sinks else None, keep_trades=keep_trades)
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+    if writer is not None:
+        writer.write({"type": "summary", **result})
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
 
 if __name__ == "__main__":
     main()
@@ -8,22 +8,28 @@
     - max_drawdown : 최대 낙폭 (%)
     - trades       : 개별 트레이드 상세 (진입/청산/보유시간)
 
+대용량 백테스트:
+    - on_trade 콜백으로 트레이드가 확정되는 즉시 외부(NDJSON, 바이너리 로그 등)로 전달
+    - keep_trades=False 이면 트레이드 리스트를 메모리에 유지하지 않음 (요약 지표만 반환)
+    - 에퀴티 곡선은 저장하지 않고 최대 낙폭을 증분 계산
+
 단순화 가정:
     - 심볼별 동시에 하나의 포지션만 (스케일 인/아웃 없음)
     - 거래 단위 1 (PnL = 출구가격 - 진입가격)
     - buy 액션 시 해당 캔들 종가로 진입, sell 액션 시 해당 캔들 종가로 청산
+    - 상위 타임프레임(15m)은 driving 봉 종가 시점까지 닫힌 캔들만 사용 (loader.build_alignment_index)
 
 향후 확장: 수수료, 슬리피지, 다중 타임프레임, 포지션 사이징 등.
 """
 from __future__ import annotations
 
 import os
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 # 패키지로 실행되지 않을 때(파일 직접 실행) 상대 임포트 오류 방지
 try:
     from .calculator import Calculator
     from .position import decide_action
-    from .loader import HistoricalLoader, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS
+    from .loader import HistoricalLoader, build_alignment_index, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS
 except ImportError:
     # project/core/backtester.py를 직접 실행하는 경우를 위한 폴백
     import os as _os
@@ -31,47 +37,73 @@ except ImportError:
     _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
     from core.calculator import Calculator  # type: ignore
     from core.position import decide_action  # type: ignore
-    from core.loader import HistoricalLoader, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS  # type: ignore
+    from core.loader import HistoricalLoader, build_alignment_index, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS  # type: ignore
 
 class Backtester:
     def __init__(self, settings_path: str = "config/settings.json", methods_path: str = "methods", historical_dir: str = "data/historical"):
         self.calc = Calculator(settings_path, methods_path)
         self.loader = HistoricalLoader(historical_dir)
 
-    def run(self, symbols: List[str], limit: Optional[int] = None) -> Dict[str, Any]:
+    def iter_bars(self, symbol: str, limit: Optional[int] = None, window: Optional[int] = None) -> Iterator[Tuple[Dict, Dict[str, List[Dict]]]]:
+        """가장 작은 타임프레임(driving) 봉마다 (해당 봉, 타임프레임별 현재까지의 윈도우)를 yield.
+
+        run()과 walk-forward 점수 캐시가 동일한 윈도우(미래 데이터 금지)를 사용하도록 공유합니다.
+        window: 타임프레임별 최근 캔들 수 상한 (None이면 처음부터 현재까지 전체 이력)
+        """
+        # 심볼별 멀티 타임프레임 데이터 로딩 (백테스트는 historical만 사용)
+        tf_series = get_multi_timeframe_candles(
+            symbol=symbol,
+            historical=self.loader,
+            live=None,
+            timeframes=["5m", "15m"],
+            window=limit or 1000000,
+        )
+        available = {tf: sorted(arr, key=lambda x: x["timestamp"]) for tf, arr in tf_series.items() if arr}
+        if not available:
+            return
+        driving_tf = min(available.keys(), key=lambda t: TIMEFRAME_TO_SECONDS.get(t, 10**12))
+        driving = available[driving_tf]  # oldest->newest
+        # 봉별로 각 타임프레임에서 "driving 봉 종가 시점까지 닫힌" 캔들 수를 한 번에 계산 (미래 데이터 금지)
+        index = build_alignment_index(available, driving_tf)
+
+        for idx, bar in enumerate(driving):
+            if window is None:
+                tf_windows: Dict[str, List[Dict]] = {tf: arr[:index[tf][idx]] for tf, arr in available.items()}
+            else:
+                tf_windows = {tf: arr[max(0, index[tf][idx] - window):index[tf][idx]] for tf, arr in available.items()}
+            yield bar, tf_windows
+
+    def run(
+        self,
+        symbols: List[str],
+        limit: Optional[int] = None,
+        on_trade: Optional[Callable[[Dict[str, Any]], None]] = None,
+        keep_trades: bool = True,
+    ) -> Dict[str, Any]:
         trades: List[Dict[str, Any]] = []
+        total_trades = 0
+        wins = 0
         total_pnl = 0.0
-        equity_curve: List[float] = []
+        drawdown = _DrawdownTracker()
+
+        def record(trade: Dict[str, Any]) -> None:
+            nonlocal total_trades, wins
+            total_trades += 1
+            if trade["pnl"] > 0:
+                wins += 1
+            if on_trade is not None:
+                on_trade(trade)
+            if keep_trades:
+                trades.append(trade)
 
         for symbol in symbols:
-            # 심볼별 멀티 타임프레임 데이터 로딩 (백테스트는 historical만 사용)
-            tf_series = get_multi_timeframe_candles(
-                symbol=symbol,
-                historical=self.loader,
-                live=None,
-                timeframes=["5m", "15m"],
-                window=limit or 1000000,
-            )
-            available = {tf: arr for tf, arr in tf_series.items() if arr}
-            if not available:
-                continue
-            driving_tf = min(available.keys(), key=lambda t: TIMEFRAME_TO_SECONDS.get(t, 10**12))
-            driving = sorted(available[driving_tf], key=lambda x: x["timestamp"])  # oldest->newest
-
+            last_bar: Optional[Dict] = None
             position_open = False
             entry_price: Optional[float] = None
             entry_time: Optional[int] = None
 
-            for idx in range(len(driving)):
-                current_ts = int(driving[idx]["timestamp"])
-                # 각 타임프레임별 현재 시점까지의 윈도우 구성 (미래 데이터 금지)
-                tf_windows: Dict[str, List[Dict]] = {}
-                for tf, arr in available.items():
-                    # 정렬 보장 후 현재 ts 이하만 포함
-                    arr_sorted = sorted(arr, key=lambda x: x["timestamp"])  # 안전하게 정렬
-                    window_arr = [c for c in arr_sorted if int(c["timestamp"]) <= current_ts]
-                    tf_windows[tf] = window_arr
-                latest = driving[idx]
+            for latest, tf_windows in self.iter_bars(symbol, limit):
+                last_bar = latest
                 score = self.calc.compute_symbol_multiTF(symbol, tf_windows)
                 current_price = latest["close"]
                 action = decide_action(score, position_open, entry_price, current_price)
@@ -84,7 +116,7 @@ class Backtester:
                     exit_price = current_price
                     pnl = exit_price - (entry_price or exit_price)
                     hold_minutes = int((latest["timestamp"] - (entry_time or latest["timestamp"])) / 60)
-                    trades.append({
+                    record({
                         "symbol": symbol,
                         "entry_price": entry_price,
                         "exit_price": exit_price,
@@ -98,17 +130,16 @@ class Backtester:
                 # 에퀴티 곡선 업데이트 (미실현 손익 포함 시 표시)
                 if position_open and entry_price is not None:
                     unrealized = current_price - entry_price
-                    equity_curve.append(total_pnl + unrealized)
+                    drawdown.update(total_pnl + unrealized)
                 else:
-                    equity_curve.append(total_pnl)
+                    drawdown.update(total_pnl)
 
             # 마지막 캔들에서 미청산 포지션 강제 청산 (옵션)
-            if position_open and entry_price is not None:
-                last_bar = driving[-1]
+            if position_open and entry_price is not None and last_bar is not None:
                 last_price = last_bar["close"]
                 pnl = last_price - entry_price
                 hold_minutes = int((int(last_bar["timestamp"]) - (entry_time or int(last_bar["timestamp"])) ) / 60)
-                trades.append({
+                record({
                     "symbol": symbol,
                     "entry_price": entry_price,
                     "exit_price": last_price,
@@ -116,35 +147,38 @@ class Backtester:
                     "hold_time_minutes": hold_minutes,
                 })
                 total_pnl += pnl
-                equity_curve.append(total_pnl)
+                drawdown.update(total_pnl)
 
-        wins = sum(1 for t in trades if t["pnl"] > 0)
-        total_trades = len(trades)
         win_rate = wins / total_trades if total_trades else 0.0
-        max_drawdown = self._compute_max_drawdown(equity_curve)
 
-        result = {
+        result: Dict[str, Any] = {
             "total_trades": total_trades,
             "win_rate": round(win_rate, 4),
             "total_pnl": round(total_pnl, 4),
-            "max_drawdown": round(max_drawdown, 4),
-            "trades": trades,
+            "max_drawdown": round(drawdown.max_drawdown, 4),
         }
+        if keep_trades:
+            result["trades"] = trades
         return result
 
-    @staticmethod
-    def _compute_max_drawdown(equity: List[float]) -> float:
-        if not equity:
-            return 0.0
-        peak = equity[0]
-        max_dd = 0.0
-        for value in equity:
-            if value > peak:
-                peak = value
-            drawdown = (value - peak) / peak if peak != 0 else 0.0
-            if drawdown < max_dd:
-                max_dd = drawdown
-        return max_dd * 100  # 퍼센트 반환
+
+class _DrawdownTracker:
+    """에퀴티 값을 하나씩 받아 최대 낙폭(%)을 증분 계산 (곡선 전체를 보관하지 않음)"""
+
+    def __init__(self) -> None:
+        self.peak: Optional[float] = None
+        self.max_dd = 0.0
+
+    def update(self, value: float) -> None:
+        if self.peak is None or value > self.peak:
+            self.peak = value
+        drawdown = (value - self.peak) / self.peak if self.peak != 0 else 0.0
+        if drawdown < self.max_dd:
+            self.max_dd = drawdown
+
+    @property
+    def max_drawdown(self) -> float:
+        return self.max_dd * 100  # 퍼센트 반환
 
 __all__ = ["Backtester"]
 
@@ -19,37 +19,80 @@
 
 Candles: 메서드가 필요로 하는 최소 키('close','volume' 등)를 가진 dict 리스트.
 가장 최신 캔들은 인덱스 -1.
+
+설정 스냅샷 (copy-on-write):
+        메서드/가중치/타임프레임 가중치는 불변 CalculatorConfig 하나로 묶여 있고,
+        refresh()는 새 스냅샷을 완성한 뒤 참조만 교체합니다. 점수 계산은 시작 시 잡은
+        스냅샷 하나만 사용하므로 재로딩 중에도 빈 메서드 테이블이나 섞인 설정을 보지 않습니다.
+        여러 심볼을 같은 설정으로 계산하려면 cfg = calc.snapshot() 후 config=cfg 로 전달.
 """
 from __future__ import annotations
 
 import json
 import importlib.util
 import os
-from typing import Dict, List, Callable
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Callable, Mapping, Optional
+
+DEFAULT_TF_WEIGHTS = {"5m": 1.0, "15m": 1.5}
+
+
+class CalculatorConfig:
+    """메서드 함수 / 메서드 가중치 / 타임프레임 가중치의 불변 스냅샷"""
+
+    __slots__ = ("method_weights", "method_funcs", "tf_weights")
+
+    def __init__(self, method_weights: Dict[str, float], method_funcs: Dict[str, Callable], tf_weights: Dict[str, float]):
+        self.method_weights: Mapping[str, float] = MappingProxyType(dict(method_weights))
+        self.method_funcs: Mapping[str, Callable] = MappingProxyType(dict(method_funcs))
+        self.tf_weights: Mapping[str, float] = MappingProxyType(dict(tf_weights))
+
 
 class Calculator:
     def __init__(self, settings_path: str, methods_path: str):
         self.settings_path = settings_path
         self.methods_path = methods_path
-        self.method_weights: Dict[str, float] = {}
-        self.method_funcs: Dict[str, Callable] = {}
-        self.tf_weights: Dict[str, float] = {}
-        self._load_settings()
-        self._load_timeframe_weights()
-        self._discover_methods()
-
-    def _load_settings(self) -> None:
+        # settings.json과 같은 폴더의 timeframes.json
+        self.timeframes_path = os.path.join(os.path.dirname(settings_path), "timeframes.json")
+        self._config = self._build_config(strict=False)
+
+    @property
+    def method_weights(self) -> Mapping[str, float]:
+        return self._config.method_weights
+
+    @property
+    def method_funcs(self) -> Mapping[str, Callable]:
+        return self._config.method_funcs
+
+    @property
+    def tf_weights(self) -> Mapping[str, float]:
+        return self._config.tf_weights
+
+    def snapshot(self) -> CalculatorConfig:
+        """현재 설정 스냅샷 (불변, 이후 refresh와 무관하게 일관성 유지)"""
+        return self._config
+
+    def _build_config(self, strict: bool = True) -> CalculatorConfig:
+        method_weights = self._load_settings()
+        return CalculatorConfig(
+            method_weights,
+            self._discover_methods(method_weights),
+            self._load_timeframe_weights(strict),
+        )
+
+    def _load_settings(self) -> Dict[str, float]:
         if not os.path.exists(self.settings_path):
             raise FileNotFoundError(f"Settings file not found: {self.settings_path}")
         with open(self.settings_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        self.method_weights = {item["method"]: float(item.get("weight", 0)) for item in data}
+        return {item["method"]: float(item.get("weight", 0)) for item in data}
 
-    def _discover_methods(self) -> None:
+    def _discover_methods(self, method_weights: Mapping[str, float]) -> Dict[str, Callable]:
         # methods_path 내 모든 .py 파일을 로드하고 settings에 등록된 METHOD_NAME 만 사용
         if not os.path.isdir(self.methods_path):
             raise FileNotFoundError(f"Methods directory not found: {self.methods_path}")
-        for fname in os.listdir(self.methods_path):
+        method_funcs: Dict[str, Callable] = {}
+        for fname in sorted(os.listdir(self.methods_path)):
             if not fname.endswith(".py") or fname.startswith("__"):
                 continue
             path = os.path.join(self.methods_path, fname)
@@ -62,25 +105,27 @@ class Calculator:
             compute_fn = getattr(module, "compute", None)
             if not method_name or not callable(compute_fn):
                 continue
-            if method_name in self.method_weights:
-                self.method_funcs[method_name] = compute_fn
+            if method_name in method_weights:
+                method_funcs[method_name] = compute_fn
+        return method_funcs
 
     def refresh(self) -> None:
-        """settings.json 변경 시 가중치 및 메서드 재로딩"""
-        self.method_weights.clear()
-        self.method_funcs.clear()
-        self._load_settings()
-        self._discover_methods()
-
-    def compute_symbol(self, symbol: str, candles: List[Dict]) -> float:
-        if not self.method_funcs:
+        """settings.json / timeframes.json / methods 변경 시 새 스냅샷을 만든 뒤 원자적으로 교체.
+
+        로딩 중 예외가 나면 기존 스냅샷을 그대로 유지하고 예외를 전달합니다.
+        """
+        self._config = self._build_config()
+
+    def compute_symbol(self, symbol: str, candles: List[Dict], config: Optional[CalculatorConfig] = None) -> float:
+        cfg = config or self._config
+        if not cfg.method_funcs:
             return 0.0
-        total_weight = sum(w for w in self.method_weights.values() if w > 0)
+        total_weight = sum(w for w in cfg.method_weights.values() if w > 0)
         if total_weight <= 0:
             return 0.0
         weighted_sum = 0.0
-        for name, fn in self.method_funcs.items():
-            weight = self.method_weights.get(name, 0)
+        for name, fn in cfg.method_funcs.items():
+            weight = cfg.method_weights.get(name, 0)
             if weight <= 0:
                 continue
             try:
@@ -96,9 +141,10 @@ class Calculator:
         return round(combined, 4)
 
     def compute_all(self, symbol_candles: Dict[str, List[Dict]]) -> Dict[str, float]:
-        return {sym: self.compute_symbol(sym, cnds) for sym, cnds in symbol_candles.items()}
+        cfg = self._config
+        return {sym: self.compute_symbol(sym, cnds, config=cfg) for sym, cnds in symbol_candles.items()}
 
-    def compute_symbol_multiTF(self, symbol: str, tf_candles: Dict[str, List[Dict]]) -> float:
+    def compute_symbol_multiTF(self, symbol: str, tf_candles: Dict[str, List[Dict]], config: Optional[CalculatorConfig] = None) -> float:
         """여러 타임프레임 캔들을 이용하여 각 메서드를 타임프레임별로 실행한 뒤
         타임프레임 가중 평균(기본: 15m 가중치 우대)으로 메서드 점수를 만들고,
         이후 메서드 가중치로 합산하여 최종 점수를 계산.
@@ -109,39 +155,42 @@ class Calculator:
             "15m": [...]
         }
         """
-        if not self.method_funcs:
+        cfg = config or self._config
+        if not cfg.method_funcs:
             return 0.0
-        total_weight = sum(w for w in self.method_weights.values() if w > 0)
-        if total_weight <= 0:
-            return 0.0
-        method_weighted_sum = 0.0
-        for name, fn in self.method_funcs.items():
-            weight = self.method_weights.get(name, 0)
-            if weight <= 0:
-                continue
-            # 타임프레임별 점수 산출 후 가중 평균
-            tf_num = 0.0
-            tf_den = 0.0
+        active = [name for name, w in cfg.method_weights.items() if w > 0]
+        raw = self.compute_method_tf_scores(symbol, tf_candles, methods=active, config=cfg)
+        return combine_scores(raw, cfg.method_weights, cfg.tf_weights)
+
+    def compute_method_tf_scores(
+        self,
+        symbol: str,
+        tf_candles: Dict[str, List[Dict]],
+        methods: Optional[Iterable[str]] = None,
+        config: Optional[CalculatorConfig] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """가중 합산 전 원시 점수 {method: {timeframe: score}} 반환.
+
+        캔들이 없거나 메서드 실행 중 예외가 난 타임프레임은 결과에서 제외됩니다.
+        methods 미지정 시 로딩된 모든 메서드를 실행 (walk-forward 캐시 등에서 사용).
+        """
+        funcs = (config or self._config).method_funcs
+        names = list(funcs) if methods is None else [m for m in methods if m in funcs]
+        raw: Dict[str, Dict[str, float]] = {}
+        for name in names:
+            fn = funcs[name]
+            per_tf: Dict[str, float] = {}
             for tf, candles in tf_candles.items():
                 if not candles:
                     continue
                 try:
-                    s = float(fn(symbol, candles))
+                    per_tf[tf] = float(fn(symbol, candles))
                 except Exception:
                     continue
-                w_tf = float(self.tf_weights.get(tf, 1.0))
-                tf_num += s * w_tf
-                tf_den += w_tf
-            method_score = (tf_num / tf_den) if tf_den > 0 else 0.0
-            method_weighted_sum += method_score * weight
-        combined = method_weighted_sum / total_weight
-        if combined > 1:
-            combined = 1.0
-        if combined < -1:
-            combined = -1.0
-        return round(combined, 4)
+            raw[name] = per_tf
+        return raw
 
-    def _load_timeframe_weights(self) -> None:
+    def _load_timeframe_weights(self, strict: bool = True) -> Dict[str, float]:
         """타임프레임 가중치 로드. 기본값: 5m=1.0, 15m=1.5
         settings.json과 같은 폴더의 timeframes.json이 있으면 사용.
         예:
@@ -149,19 +198,50 @@ class Calculator:
           "5m": 1.0,
           "15m": 1.5
         }
+        파일이 없으면 기본값을 사용합니다. 파싱 오류는 strict=False(최초 생성)면 기본값으로 대체하고,
+        strict=True(refresh)면 그대로 전달하여 기존 스냅샷이 유지되도록 합니다 (반쯤 쓰인 파일 방지).
         """
-        default = {"5m": 1.0, "15m": 1.5}
+        if not os.path.exists(self.timeframes_path):
+            return dict(DEFAULT_TF_WEIGHTS)
         try:
-            base_dir = os.path.dirname(self.settings_path)
-            tf_path = os.path.join(base_dir, "timeframes.json")
-            if os.path.exists(tf_path):
-                with open(tf_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                # 필터: 숫자값만 반영
-                self.tf_weights = {str(k): float(v) for k, v in data.items()}
-            else:
-                self.tf_weights = default
+            with open(self.timeframes_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(k): float(v) for k, v in data.items()}
         except Exception:
-            self.tf_weights = default
-
-__all__ = ["Calculator"]
+            if strict:
+                raise
+            return dict(DEFAULT_TF_WEIGHTS)
+
+def combine_scores(
+    raw: Dict[str, Dict[str, float]],
+    method_weights: Mapping[str, float],
+    tf_weights: Mapping[str, float],
+) -> float:
+    """원시 점수 {method: {timeframe: score}}를 타임프레임 가중 평균 → 메서드 가중 평균으로 합산.
+
+    Calculator 인스턴스 없이 동작하므로 다른 프로세스에서 가중치만 바꿔가며 재사용할 수 있습니다.
+    """
+    total_weight = sum(w for w in method_weights.values() if w > 0)
+    if total_weight <= 0:
+        return 0.0
+    method_weighted_sum = 0.0
+    for name, weight in method_weights.items():
+        if weight <= 0:
+            continue
+        # 타임프레임별 점수 가중 평균
+        tf_num = 0.0
+        tf_den = 0.0
+        for tf, s in raw.get(name, {}).items():
+            w_tf = float(tf_weights.get(tf, 1.0))
+            tf_num += s * w_tf
+            tf_den += w_tf
+        method_score = (tf_num / tf_den) if tf_den > 0 else 0.0
+        method_weighted_sum += method_score * weight
+    combined = method_weighted_sum / total_weight
+    if combined > 1:
+        combined = 1.0
+    if combined < -1:
+        combined = -1.0
+    return round(combined, 4)
+
+__all__ = ["Calculator", "CalculatorConfig", "combine_scores"]
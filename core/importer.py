@@ -0,0 +1,170 @@
+"""Binance kline 덤프 일괄 임포터
+
+data.binance.vision 월별/일별 kline zip(또는 압축 해제된 csv)을 프로젝트 레이아웃
+`data/historical/<tf>/<SYMBOL>.csv` (timestamp,open,high,low,close,volume) 으로 변환합니다.
+
+Binance kline CSV (12 컬럼, 헤더 없음 / 최신 덤프는 헤더 있음):
+    open_time, open, high, low, close, volume, close_time, quote_volume,
+    trades, taker_buy_base, taker_buy_quote, ignore
+
+처리:
+    - 파일명(예: BTCUSDT-5m-2024-01.zip)에서 심볼/타임프레임 추출
+    - open_time 밀리초(2025년 이후 spot 덤프는 마이크로초)를 초 단위로 변환
+    - 기존 CSV와 병합, timestamp 중복 제거(나중에 읽은 값 우선) 후 정렬
+    - 타임프레임 간격 기준 누락 구간(gap) 및 간격에 맞지 않는 timestamp 검사
+    - 임시 파일에 쓴 뒤 교체하여 중간에 실패해도 기존 파일 보존
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import re
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .loader import HISTORICAL_DIR, CANDLE_KEYS, read_candles
+except ImportError:
+    import sys as _sys
+    _sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.loader import HISTORICAL_DIR, CANDLE_KEYS, read_candles  # type: ignore
+
+_DUMP_NAME = re.compile(r"^(?P<symbol>[A-Z0-9]+)-(?P<interval>\d+[smhdwM])-")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def interval_seconds(interval: str) -> Optional[int]:
+    """'5m' -> 300, '1h' -> 3600. 월봉('1M')처럼 길이가 일정하지 않으면 None"""
+    m = re.fullmatch(r"(\d+)([smhdw])", interval)
+    if not m:
+        return None
+    return int(m.group(1)) * _UNIT_SECONDS[m.group(2)]
+
+
+def parse_dump_name(path: str) -> Tuple[str, str]:
+    """'BTCUSDT-5m-2024-01.zip' -> ('BTCUSDT', '5m')"""
+    name = os.path.basename(path)
+    m = _DUMP_NAME.match(name)
+    if not m:
+        raise ValueError(f"Cannot infer symbol/interval from file name: {name}")
+    return m.group("symbol"), m.group("interval")
+
+
+def _to_seconds(open_time: int) -> int:
+    if open_time >= 10**14:  # 마이크로초
+        return open_time // 1_000_000
+    if open_time >= 10**11:  # 밀리초
+        return open_time // 1000
+    return open_time
+
+
+def _iter_csv_rows(stream: io.TextIOBase) -> Iterator[Dict]:
+    for row in csv.reader(stream):
+        if not row or not row[0].strip().isdigit():
+            continue  # 빈 줄 / 헤더
+        yield {
+            "timestamp": _to_seconds(int(row[0])),
+            "open": float(row[1]),
+            "high": float(row[2]),
+            "low": float(row[3]),
+            "close": float(row[4]),
+            "volume": float(row[5]),
+        }
+
+
+def iter_klines(path: str) -> Iterator[Dict]:
+    """zip(내부 csv 전부) 또는 csv 파일에서 캔들 dict를 순서대로 yield"""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for member in sorted(zf.namelist()):
+                if not member.endswith(".csv"):
+                    continue
+                with zf.open(member) as raw:
+                    yield from _iter_csv_rows(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            yield from _iter_csv_rows(f)
+
+
+def find_gaps(timestamps: List[int], interval: int) -> Dict[str, object]:
+    """정렬된 timestamp 목록에서 누락 구간과 간격 불일치 개수를 찾음"""
+    gaps: List[Dict[str, int]] = []
+    missing = 0
+    for prev, cur in zip(timestamps, timestamps[1:]):
+        diff = cur - prev
+        if diff > interval:
+            n = diff // interval - 1 if diff % interval == 0 else diff // interval
+            gaps.append({"after": prev, "before": cur, "missing": n})
+            missing += n
+    misaligned = sum(1 for t in timestamps if t % interval)
+    return {"gaps": gaps, "missing_candles": missing, "misaligned": misaligned}
+
+
+def _fmt(value: float) -> str:
+    text = repr(float(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+def write_candles(path: str, candles: Iterable[Dict]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(CANDLE_KEYS) + "\n")
+        for c in candles:
+            f.write(f"{int(c['timestamp'])},{_fmt(c['open'])},{_fmt(c['high'])},{_fmt(c['low'])},{_fmt(c['close'])},{_fmt(c['volume'])}\n")
+    os.replace(tmp, path)
+
+
+def import_dumps(
+    paths: Iterable[str],
+    out_dir: str = HISTORICAL_DIR,
+    strip_quote: Optional[str] = None,
+    merge: bool = True,
+) -> Dict[str, Dict[str, object]]:
+    """덤프 파일들을 (심볼, 타임프레임)별로 모아 out_dir/<tf>/<SYMBOL>.csv 로 기록.
+
+    strip_quote: 심볼 접미사 제거 (예: 'USDT' → BTCUSDT → BTC)
+    merge      : 기존 CSV가 있으면 병합 (False면 덮어쓰기)
+    반환: {"<SYMBOL>/<tf>": {rows, imported, duplicates, gaps, missing_candles, misaligned, path}}
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for path in paths:
+        symbol, interval = parse_dump_name(path)
+        if strip_quote and symbol.endswith(strip_quote) and len(symbol) > len(strip_quote):
+            symbol = symbol[: -len(strip_quote)]
+        groups.setdefault((symbol, interval), []).append(path)
+
+    report: Dict[str, Dict[str, object]] = {}
+    for (symbol, interval), files in sorted(groups.items()):
+        out_path = os.path.join(out_dir, interval, f"{symbol}.csv")
+        by_ts: Dict[int, Dict] = {}
+        if merge and os.path.exists(out_path):
+            for c in read_candles(out_path):
+                by_ts[int(c["timestamp"])] = c
+        imported = 0
+        duplicates = 0
+        for path in sorted(files):
+            for c in iter_klines(path):
+                if c["timestamp"] in by_ts:
+                    duplicates += 1
+                by_ts[c["timestamp"]] = c
+                imported += 1
+        stamps = sorted(by_ts)
+        write_candles(out_path, (by_ts[t] for t in stamps))
+        entry: Dict[str, object] = {"path": out_path, "rows": len(stamps), "imported": imported, "duplicates": duplicates}
+        step = interval_seconds(interval)
+        if step:
+            entry.update(find_gaps(stamps, step))
+        report[f"{symbol}/{interval}"] = entry
+    return report
+
+
+__all__ = [
+    "import_dumps",
+    "iter_klines",
+    "find_gaps",
+    "interval_seconds",
+    "parse_dump_name",
+    "write_candles",
+]
@@ -0,0 +1,126 @@
+"""출력 레이어 (스트리밍)
+
+큰 결과 dict를 만든 뒤 한 번에 `json.dumps(..., indent=2)` 하는 대신,
+레코드가 생성되는 즉시 내보낼 수 있는 writer들을 제공합니다.
+
+    - NDJSONWriter   : 레코드 1개 = JSON 1줄 (build_output 결과, 트레이드, 요약)
+    - TradeLogWriter : 대용량 백테스트용 struct 패킹 바이너리 트레이드 로그
+    - read_trade_log : 바이너리 트레이드 로그를 트레이드 dict로 다시 읽기
+
+바이너리 트레이드 로그 포맷 (little-endian):
+    헤더   : b"CBTL" + uint16 버전
+    레코드 : uint8 타입 + 본문
+        타입 0 (심볼 정의) : uint16 심볼 id, uint16 길이, utf-8 바이트
+        타입 1 (트레이드)  : uint16 심볼 id, f64 entry, f64 exit, f64 pnl, i64 hold_time_minutes
+
+사용 예:
+    writer = NDJSONWriter(sys.stdout)
+    bt.run(symbols, on_trade=lambda t: writer.write({"type": "trade", **t}), keep_trades=False)
+"""
+from __future__ import annotations
+
+import json
+import struct
+from typing import IO, Any, BinaryIO, Dict, Iterator
+
+TRADE_LOG_MAGIC = b"CBTL"
+TRADE_LOG_VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_REC_TYPE = struct.Struct("<B")
+_SYMBOL_DEF = struct.Struct("<HH")
+_TRADE = struct.Struct("<Hdddq")
+
+_REC_SYMBOL = 0
+_REC_TRADE = 1
+
+
+class NDJSONWriter:
+    """레코드를 한 줄짜리 JSON으로 즉시 기록 (Newline Delimited JSON)"""
+
+    def __init__(self, stream: IO[str], flush: bool = True):
+        self.stream = stream
+        self.flush = flush
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self.stream.write("\n")
+        if self.flush:
+            self.stream.flush()
+        self.count += 1
+
+
+class TradeLogWriter:
+    """트레이드를 고정 길이 바이너리 레코드로 기록.
+
+    심볼 문자열은 처음 등장할 때 한 번만 정의 레코드로 기록하고 이후에는 id로 참조합니다.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.symbol_ids: Dict[str, int] = {}
+        self.count = 0
+        self.stream.write(_HEADER.pack(TRADE_LOG_MAGIC, TRADE_LOG_VERSION))
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbol_ids)
+            raw = symbol.encode("utf-8")
+            self.stream.write(_REC_TYPE.pack(_REC_SYMBOL))
+            self.stream.write(_SYMBOL_DEF.pack(sid, len(raw)))
+            self.stream.write(raw)
+            self.symbol_ids[symbol] = sid
+        return sid
+
+    def write(self, trade: Dict[str, Any]) -> None:
+        sid = self._symbol_id(str(trade["symbol"]))
+        self.stream.write(_REC_TYPE.pack(_REC_TRADE))
+        self.stream.write(_TRADE.pack(
+            sid,
+            float(trade["entry_price"]),
+            float(trade["exit_price"]),
+            float(trade["pnl"]),
+            int(trade["hold_time_minutes"]),
+        ))
+        self.count += 1
+
+
+def read_trade_log(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """TradeLogWriter가 기록한 파일을 순차적으로 읽어 트레이드 dict를 yield"""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Trade log header truncated")
+    magic, version = _HEADER.unpack(header)
+    if magic != TRADE_LOG_MAGIC:
+        raise ValueError(f"Not a trade log file (magic={magic!r})")
+    if version != TRADE_LOG_VERSION:
+        raise ValueError(f"Unsupported trade log version: {version}")
+    symbols: Dict[int, str] = {}
+    while True:
+        tag = stream.read(_REC_TYPE.size)
+        if not tag:
+            return
+        (rec_type,) = _REC_TYPE.unpack(tag)
+        if rec_type == _REC_SYMBOL:
+            sid, length = _SYMBOL_DEF.unpack(stream.read(_SYMBOL_DEF.size))
+            symbols[sid] = stream.read(length).decode("utf-8")
+        elif rec_type == _REC_TRADE:
+            sid, entry, exit_, pnl, hold = _TRADE.unpack(stream.read(_TRADE.size))
+            yield {
+                "symbol": symbols[sid],
+                "entry_price": entry,
+                "exit_price": exit_,
+                "pnl": pnl,
+                "hold_time_minutes": hold,
+            }
+        else:
+            raise ValueError(f"Unknown trade log record type: {rec_type}")
+
+
+__all__ = [
+    "NDJSONWriter",
+    "TradeLogWriter",
+    "read_trade_log",
+]
@@ -24,7 +24,23 @@ BUY_THRESHOLD = 0.4
 SELL_THRESHOLD = -0.4
 STOP_LOSS_PCT = -0.05  # -5%
 
-def decide_action(score: float, has_position: bool, entry_price: Optional[float], current_price: float) -> str:
+def decide_action(
+    score: float,
+    has_position: bool,
+    entry_price: Optional[float],
+    current_price: float,
+    buy_threshold: Optional[float] = None,
+    sell_threshold: Optional[float] = None,
+    stop_loss_pct: Optional[float] = None,
+) -> str:
+    """임계값 인자를 생략하면 모듈 상수(BUY_THRESHOLD 등)를 사용 (walk-forward 최적화 시 덮어쓰기)"""
+    if buy_threshold is None:
+        buy_threshold = BUY_THRESHOLD
+    if sell_threshold is None:
+        sell_threshold = SELL_THRESHOLD
+    if stop_loss_pct is None:
+        stop_loss_pct = STOP_LOSS_PCT
+
     # score 범위 보정
     if score > 1:
         score = 1.0
@@ -32,7 +48,7 @@ def decide_action(score: float, has_position: bool, entry_price: Optional[float]
         score = -1.0
 
     if not has_position:
-        if score >= BUY_THRESHOLD:
+        if score >= buy_threshold:
             return "buy"
         else:
             return "hold"
@@ -46,11 +62,11 @@ def decide_action(score: float, has_position: bool, entry_price: Optional[float]
     pnl_pct = (current_price - entry_price) / entry_price
 
     # 손절 조건
-    if pnl_pct <= STOP_LOSS_PCT:
+    if pnl_pct <= stop_loss_pct:
         return "sell"
 
     # 점수 기반 청산 조건
-    if score <= SELL_THRESHOLD:
+    if score <= sell_threshold:
         return "sell"
 
     return "hold"
@@ -0,0 +1,227 @@
+"""결정적 마켓 리플레이 엔진 (실시간 경로 지연시간 테스트)
+
+기록된 과거 캔들을 실시간 파이프라인과 동일한 경로로 흘려보냅니다:
+    get_multi_timeframe_candles → Calculator.compute_symbol_multiTF → build_output
+
+구성:
+    - ReplayFeed   : HistoricalLoader 데이터를 "현재 시각" 커서 기준으로 잘라 보여주는
+                     LiveLoader 호환 피드 (커서 시각까지 닫힌 캔들만 보임)
+    - ReplayEngine : driving 타임프레임 봉 단위로 커서를 전진시키며 모든 심볼을 처리하고
+                     틱별/심볼별 지연시간, 처리량을 기록
+
+속도:
+    - speed=0  : 최대 속도 (대기 없음)
+    - speed=1  : 실제 시간 (5m 봉이면 5분마다 1틱)
+    - speed=N  : N배속
+
+합성 심볼:
+    n_symbols 만큼 SYN0000, SYN0001 ... 심볼을 만들고 원본 심볼 데이터를 순환 배정합니다.
+    데이터는 복사하지 않고 원본 리스트를 공유합니다.
+
+결정성:
+    같은 데이터/설정이면 항상 같은 출력이 나오며, 출력 전체의 sha256 digest로 릴리스 간 비교 가능.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from .calculator import Calculator, CalculatorConfig
+    from .loader import HistoricalLoader, LiveLoader, candle_close_times, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS
+    from .position import build_output
+except ImportError:
+    import os as _os
+    import sys as _sys
+    _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+    from core.calculator import Calculator, CalculatorConfig  # type: ignore
+    from core.loader import HistoricalLoader, LiveLoader, candle_close_times, get_multi_timeframe_candles, TIMEFRAME_TO_SECONDS  # type: ignore
+    from core.position import build_output  # type: ignore
+
+
+class ReplayFeed(LiveLoader):
+    """커서 시각까지의 캔들만 노출하는 피드. live/historical 양쪽 인자로 그대로 전달 가능."""
+
+    def __init__(
+        self,
+        historical: HistoricalLoader,
+        source_symbols: Sequence[str],
+        timeframes: Sequence[str],
+        n_symbols: Optional[int] = None,
+    ):
+        super().__init__(directory="")
+        self.timeframes = list(timeframes)
+        self.now: Optional[int] = None
+        # 원본 심볼별 {tf: (close_times, candles)}
+        self.sources: Dict[str, Dict[str, tuple]] = {}
+        for src in source_symbols:
+            tf_series = get_multi_timeframe_candles(
+                symbol=src,
+                historical=historical,
+                live=None,
+                timeframes=self.timeframes,
+                window=1000000,
+            )
+            series = {}
+            for tf, arr in tf_series.items():
+                arr = sorted(arr, key=lambda x: x["timestamp"])
+                series[tf] = (candle_close_times(arr, tf), arr)
+            if any(arr for _, arr in series.values()):
+                self.sources[src] = series
+        if not self.sources:
+            raise ValueError("No historical data for replay sources")
+        names = list(self.sources)
+        if n_symbols is None:
+            self.symbol_map = {s: s for s in names}
+        else:
+            self.symbol_map = {f"SYN{i:04d}": names[i % len(names)] for i in range(n_symbols)}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.symbol_map)
+
+    def driving_timeframe(self) -> str:
+        return min(self.timeframes, key=lambda t: TIMEFRAME_TO_SECONDS.get(t, 10**12))
+
+    def timeline(self) -> List[int]:
+        """모든 원본 심볼의 driving 타임프레임 봉 종가 시각 합집합 (오름차순) = 틱 시각"""
+        tf = self.driving_timeframe()
+        stamps = set()
+        for series in self.sources.values():
+            stamps.update(series.get(tf, ([], []))[0])
+        return sorted(stamps)
+
+    def set_time(self, ts: int) -> None:
+        """커서 이동. ts 시각까지 닫힌(timestamp + 타임프레임 길이 <= ts) 캔들만 노출"""
+        self.now = ts
+
+    def _visible(self, symbol: str, timeframe: str, limit: Optional[int]) -> List[Dict]:
+        src = self.symbol_map.get(symbol)
+        if src is None or timeframe not in self.sources[src]:
+            return []
+        closes, arr = self.sources[src][timeframe]
+        end = len(arr) if self.now is None else bisect_right(closes, self.now)
+        start = 0 if limit is None else max(0, end - limit)
+        return arr[start:end]
+
+    def get_latest(self, symbol: str, limit: int = 100) -> List[Dict]:
+        return self._visible(symbol, self.driving_timeframe(), limit)
+
+    def get_latest_tf(self, symbol: str, timeframe: str, limit: int = 100) -> List[Dict]:
+        return self._visible(symbol, timeframe, limit)
+
+    def load_tf(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> List[Dict]:
+        # get_multi_timeframe_candles의 historical 폴백도 커서 이후 데이터를 보지 않도록 동일 처리
+        return self._visible(symbol, timeframe, limit)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """nearest-rank 백분위수 (values는 정렬 불필요)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(-(-pct * len(ordered) // 100)))  # ceil
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _latency_summary(samples_ms: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "max_ms": round(max(samples_ms), 4) if samples_ms else 0.0,
+    }
+
+
+class ReplayEngine:
+    def __init__(self, calc: Calculator, feed: ReplayFeed, window: int = 360):
+        self.calc = calc
+        self.feed = feed
+        self.window = window
+        # 리플레이 중 생성된 action에 따라 포지션 상태를 갱신 (손절 경로까지 실행되도록)
+        self.positions: Dict[str, Dict[str, Any]] = {}
+
+    def process_symbol(self, symbol: str, config: Optional[CalculatorConfig] = None) -> Optional[Dict]:
+        tf_candles = get_multi_timeframe_candles(
+            symbol=symbol,
+            historical=self.feed,  # type: ignore[arg-type]
+            live=self.feed,
+            timeframes=self.feed.timeframes,
+            window=self.window,
+        )
+        base = tf_candles.get(self.feed.driving_timeframe(), [])
+        if not base:
+            return None
+        score = self.calc.compute_symbol_multiTF(symbol, tf_candles, config=config)
+        current_price = base[-1]["close"]
+        p_state = self.positions.get(symbol, {"has_position": False, "entry_price": None})
+        out = build_output(symbol, score, p_state["has_position"], p_state["entry_price"], current_price)
+        action = out[symbol]["action"]
+        if action == "buy":
+            self.positions[symbol] = {"has_position": True, "entry_price": current_price}
+        elif action == "sell":
+            self.positions[symbol] = {"has_position": False, "entry_price": None}
+        return out
+
+    def run(self, speed: float = 0.0, max_ticks: Optional[int] = None, budget_seconds: Optional[float] = None) -> Dict[str, Any]:
+        timeline = self.feed.timeline()
+        if max_ticks is not None:
+            timeline = timeline[:max_ticks]
+        symbols = self.feed.symbols
+        interval = TIMEFRAME_TO_SECONDS.get(self.feed.driving_timeframe(), 60)
+        if budget_seconds is None:
+            budget_seconds = interval / speed if speed > 0 else float(interval)
+
+        digest = hashlib.sha256()
+        tick_ms: List[float] = []
+        symbol_ms: List[float] = []
+        outputs = 0
+        missed = 0
+        started = time.perf_counter()
+        t0 = timeline[0] if timeline else 0
+
+        for ts in timeline:
+            if speed > 0:
+                # 틱 예정 시각까지 대기 (처리가 늦어졌으면 바로 진행)
+                due = started + (ts - t0) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.feed.set_time(ts)
+            tick_start = time.perf_counter_ns()
+            config = self.calc.snapshot()
+            for symbol in symbols:
+                sym_start = time.perf_counter_ns()
+                out = self.process_symbol(symbol, config)
+                symbol_ms.append((time.perf_counter_ns() - sym_start) / 1e6)
+                if out is not None:
+                    outputs += 1
+                    digest.update(json.dumps(out, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+            elapsed_ms = (time.perf_counter_ns() - tick_start) / 1e6
+            tick_ms.append(elapsed_ms)
+            if elapsed_ms > budget_seconds * 1000:
+                missed += 1
+
+        wall = time.perf_counter() - started
+        busy = sum(tick_ms) / 1000
+        p99_tick = percentile(tick_ms, 99) / 1000
+        return {
+            "symbols": len(symbols),
+            "ticks": len(timeline),
+            "outputs": outputs,
+            "speed": speed,
+            "wall_seconds": round(wall, 4),
+            "tick_latency": _latency_summary(tick_ms),
+            "symbol_latency": _latency_summary(symbol_ms),
+            "throughput_symbols_per_sec": round(len(symbol_ms) / busy, 2) if busy > 0 else 0.0,
+            "budget_seconds": budget_seconds,
+            "deadline_misses": missed,
+            # budget / p99 틱 지연 > 1 이면 해당 심볼 수를 실시간으로 따라갈 수 있음
+            "headroom": round(budget_seconds / p99_tick, 2) if p99_tick > 0 else None,
+            "digest": digest.hexdigest(),
+        }
+
+
+__all__ = ["ReplayFeed", "ReplayEngine", "percentile"]
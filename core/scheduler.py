@@ -0,0 +1,165 @@
+"""적응형 스코어링 스케줄러
+
+매 호출마다 SYMBOLS 전체를 계산하는 대신, 새 캔들이 들어온 심볼만 계산합니다.
+
+    ingestion ──mark_dirty(symbol, tf)──▶ ScoringScheduler ──next_batch()──▶ 스코어링
+
+    - dirty 플래그: 심볼별로 갱신된 타임프레임 집합을 기록, 계산 전 여러 번 갱신돼도 1회만 계산
+    - 우선순위: 포지션 보유 심볼을 먼저 반환 (decide_action 손절 체크가 지연에 민감)
+    - 버스트 병합: 첫 dirty 표시 후 coalesce_seconds 동안 기다려 같은 봉 경계에서
+      동시에 닫히는 캔들들을 한 배치로 묶음
+
+조용한 시장에서는 dirty 심볼이 적으므로 CPU 사용량이 유니버스 크기가 아니라 갱신 빈도에 비례합니다.
+
+FileChangeDetector는 CSV 스냅샷 기반 데모용 ingestion으로, 각 심볼/타임프레임의 파일
+(mtime, size)만 확인하여 변경 시 mark_dirty를 호출합니다. WebSocket 연동 시에는
+캔들 수신 콜백에서 scheduler.mark_dirty()를 직접 호출하면 됩니다.
+
+사용 예:
+    scheduler = ScoringScheduler()
+    detector = FileChangeDetector(scheduler, SYMBOLS, ["5m", "15m"], historical, live).start()
+    while True:
+        for symbol, tfs in scheduler.next_batch(priority=held_symbols, timeout=60):
+            ...
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    from .loader import HistoricalLoader, LiveLoader
+except ImportError:
+    import sys as _sys
+    _sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.loader import HistoricalLoader, LiveLoader  # type: ignore
+
+
+class ScoringScheduler:
+    def __init__(self, coalesce_seconds: float = 0.05):
+        self.coalesce_seconds = coalesce_seconds
+        self._cond = threading.Condition()
+        # 삽입 순서 유지 (먼저 갱신된 심볼이 먼저 계산됨)
+        self._dirty: Dict[str, Set[str]] = {}
+        self._first_mark: Optional[float] = None
+
+    def mark_dirty(self, symbol: str, timeframe: str) -> None:
+        with self._cond:
+            if not self._dirty:
+                self._first_mark = time.monotonic()
+            self._dirty.setdefault(symbol, set()).add(timeframe)
+            self._cond.notify_all()
+
+    def mark_all(self, symbols: Iterable[str], timeframes: Iterable[str]) -> None:
+        tfs = list(timeframes)
+        with self._cond:
+            if not self._dirty:
+                self._first_mark = time.monotonic()
+            for symbol in symbols:
+                self._dirty.setdefault(symbol, set()).update(tfs)
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._dirty)
+
+    def next_batch(
+        self,
+        priority: Union[Iterable[str], Callable[[str], bool]] = (),
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[str, Set[str]]]:
+        """dirty 심볼을 모두 꺼내 [(symbol, 갱신된 타임프레임들)]로 반환하고 플래그를 지움.
+
+        priority: 먼저 처리할 심볼 집합 또는 판별 함수 (예: 포지션 보유 여부)
+        timeout : dirty 심볼이 생길 때까지 최대 대기 시간(초). 없으면 빈 리스트 반환.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._dirty:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+            # 같은 봉 경계의 후속 갱신을 한 배치로 병합
+            if self._first_mark is not None:
+                settle = self._first_mark + self.coalesce_seconds - time.monotonic()
+                while settle > 0:
+                    self._cond.wait(settle)
+                    settle = self._first_mark + self.coalesce_seconds - time.monotonic()
+            dirty = self._dirty
+            self._dirty = {}
+            self._first_mark = None
+
+        is_priority = priority if callable(priority) else set(priority).__contains__
+        items = list(dirty.items())
+        return [it for it in items if is_priority(it[0])] + [it for it in items if not is_priority(it[0])]
+
+
+class FileChangeDetector:
+    """CSV 스냅샷 파일의 (mtime, size) 변화를 폴링해 스케줄러에 dirty 표시"""
+
+    def __init__(
+        self,
+        scheduler: ScoringScheduler,
+        symbols: Sequence[str],
+        timeframes: Sequence[str],
+        historical: Optional[HistoricalLoader] = None,
+        live: Optional[LiveLoader] = None,
+        interval: float = 1.0,
+    ):
+        self.scheduler = scheduler
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.loaders = [ldr for ldr in (live, historical) if ldr is not None]
+        self.interval = interval
+        self._seen: Dict[Tuple[str, str], Tuple] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stamp(self, symbol: str, timeframe: str) -> Tuple:
+        stamp = []
+        for loader in self.loaders:
+            for path in loader.paths_tf(symbol, timeframe):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                stamp.append((path, st.st_mtime_ns, st.st_size))
+                break  # 로더는 우선순위가 가장 높은 파일만 읽음
+        return tuple(stamp)
+
+    def poll(self) -> int:
+        """한 번 확인하여 변경된 (symbol, tf) 수 반환. 첫 호출은 모든 심볼을 dirty로 표시."""
+        changed = 0
+        for symbol in self.symbols:
+            for tf in self.timeframes:
+                stamp = self._stamp(symbol, tf)
+                key = (symbol, tf)
+                if self._seen.get(key) != stamp:
+                    self._seen[key] = stamp
+                    self.scheduler.mark_dirty(symbol, tf)
+                    changed += 1
+        return changed
+
+    def _run(self) -> None:
+        self.poll()
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> "FileChangeDetector":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="candle-detector", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+__all__ = ["ScoringScheduler", "FileChangeDetector"]
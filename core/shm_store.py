@@ -0,0 +1,325 @@
+"""공유 메모리 캔들 저장소
+
+여러 스코어링 워커 프로세스가 CSV를 각자 읽어 list-of-dicts 사본을 들고 있는 대신,
+ingest 프로세스 하나가 `multiprocessing.shared_memory`에 캔들을 기록하고
+N개의 워커가 같은 메모리를 직접 읽습니다. 워커 수와 무관하게 데이터는 한 벌만 존재하고
+ingest → score 전달 시 pickle 이 없습니다.
+
+세그먼트 (심볼/타임프레임별 1개, 이름: <prefix>_<SYMBOL>_<tf>):
+    header  : int64 x 4  [seq, capacity, count, magic]
+    columns : timestamp(int64) / open / high / low / close / volume (float64), 각 capacity 길이
+    캔들은 링 버퍼로 저장되며 count는 지금까지 기록된 총 개수 (최신 capacity개 유지)
+
+일관성 (seqlock):
+    - writer: seq를 홀수로 올림 → 기록 → 짝수로 올림
+    - writer는 세그먼트를 배타적으로 생성한 프로세스 1개뿐 (기존 세그먼트에 writer로 연결하지 않음)
+    - reader: seq가 짝수일 때 읽기 시작, 복사 후 seq가 같으면 성공, 아니면 재시도
+    → reader는 잠금 없이 읽으며 반쯤 쓰인(torn) 캔들을 절대 보지 않습니다.
+
+reader는 요청한 윈도우만 공유 메모리에서 복사하여 메서드 규약대로 dict 리스트로 반환합니다.
+get_latest_tf/load_tf 를 제공하므로 get_multi_timeframe_candles 의 live/historical 인자로 그대로 사용 가능.
+
+사용 예:
+    # ingest 프로세스 (같은 이름의 세그먼트가 이미 있으면 FileExistsError, replace=True면 지우고 재생성)
+    store = SharedCandleStore("cobot", create=True, capacity=4096)
+    ingest_historical(store, HistoricalLoader("data/historical"), ["BTC", "ETH"], ["5m", "15m"])
+    store.append("BTC", "5m", new_candle)
+
+    # 워커 프로세스
+    store = SharedCandleStore("cobot")
+    tf_candles = get_multi_timeframe_candles("BTC", historical=store, live=store)
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .loader import HistoricalLoader, LiveLoader
+except ImportError:
+    import os as _os
+    sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+    from core.loader import HistoricalLoader, LiveLoader  # type: ignore
+
+MAGIC = 0x43424F54  # "CBOT"
+DEFAULT_CAPACITY = 4096
+
+_HEADER_FIELDS = 4
+_SEQ, _CAPACITY, _COUNT, _MAGIC = range(_HEADER_FIELDS)
+_FLOAT_COLUMNS = ("open", "high", "low", "close", "volume")
+_ITEM = 8  # int64 / float64
+
+
+def _segment_size(capacity: int) -> int:
+    return _ITEM * (_HEADER_FIELDS + capacity * (1 + len(_FLOAT_COLUMNS)))
+
+
+# resource_tracker.register 임시 교체는 프로세스 전역이므로, 교체 중에는 세그먼트 생성/연결을 직렬화
+_TRACKER_LOCK = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """기존 세그먼트에 연결. reader는 resource_tracker에 등록하지 않음
+    (등록하면 reader 프로세스 종료 시 tracker가 writer 소유 세그먼트를 지워버림)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None  # type: ignore[assignment]
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register  # type: ignore[assignment]
+
+
+def _unlink(name: str) -> None:
+    """남아 있는 세그먼트 삭제 (비정상 종료한 이전 writer가 남긴 세그먼트 정리용).
+    tracker 등록 후 unlink로 해제되도록 일반 연결을 사용하며, register 교체와 겹치지 않게 잠금."""
+    with _TRACKER_LOCK:
+        shm = shared_memory.SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+
+class SharedCandleBuffer:
+    """심볼/타임프레임 1개의 공유 메모리 링 버퍼"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        self.header = buf[: _ITEM * _HEADER_FIELDS].cast("q")
+        if self.header[_MAGIC] != MAGIC:
+            raise ValueError(f"Not a candle buffer: {shm.name}")
+        capacity = int(self.header[_CAPACITY])
+        self.capacity = capacity
+        offset = _ITEM * _HEADER_FIELDS
+        self.timestamps = buf[offset: offset + _ITEM * capacity].cast("q")
+        offset += _ITEM * capacity
+        self.columns = {}
+        for key in _FLOAT_COLUMNS:
+            self.columns[key] = buf[offset: offset + _ITEM * capacity].cast("d")
+            offset += _ITEM * capacity
+
+    @classmethod
+    def create(cls, name: str, capacity: int = DEFAULT_CAPACITY) -> "SharedCandleBuffer":
+        """새 세그먼트를 배타적으로 생성. 같은 이름이 이미 있으면 FileExistsError."""
+        with _TRACKER_LOCK:  # _attach의 register 교체 중에 생성되면 tracker 등록이 누락됨
+            shm = shared_memory.SharedMemory(name=name, create=True, size=_segment_size(capacity))
+        header = shm.buf[: _ITEM * _HEADER_FIELDS].cast("q")
+        header[_SEQ] = 0
+        header[_CAPACITY] = capacity
+        header[_COUNT] = 0
+        header[_MAGIC] = MAGIC  # 마지막에 기록: reader는 MAGIC이 보여야 초기화 완료로 간주
+        header.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> Optional["SharedCandleBuffer"]:
+        """기존 세그먼트에 연결. writer가 아직 생성/헤더 초기화 중이면 None (다음 호출에서 재시도)."""
+        try:
+            shm = _attach(name)
+        except ValueError:  # 생성 직후 크기 설정 전 (빈 세그먼트는 mmap 불가)
+            return None
+        if shm.size < _ITEM * _HEADER_FIELDS:
+            shm.close()
+            return None
+        header = shm.buf[: _ITEM * _HEADER_FIELDS].cast("q")
+        magic = header[_MAGIC]
+        header.release()
+        if magic == 0:
+            shm.close()
+            return None
+        return cls(shm, owner=False)
+
+    # ---- writer ----
+    def _write_slot(self, index: int, candle: Dict) -> None:
+        slot = index % self.capacity
+        self.timestamps[slot] = int(candle["timestamp"])
+        for key, col in self.columns.items():
+            col[slot] = float(candle[key])
+
+    def extend(self, candles: Sequence[Dict]) -> None:
+        """캔들 추가. 마지막 캔들과 같은 timestamp면 덮어쓰기(진행 중 캔들 갱신), 과거 timestamp는 무시."""
+        if not candles:
+            return
+        header = self.header
+        header[_SEQ] += 1  # 홀수: 기록 중
+        try:
+            count = int(header[_COUNT])
+            last_ts = int(self.timestamps[(count - 1) % self.capacity]) if count else None
+            for c in candles:
+                ts = int(c["timestamp"])
+                if last_ts is not None and ts < last_ts:
+                    continue
+                if last_ts is not None and ts == last_ts:
+                    self._write_slot(count - 1, c)
+                else:
+                    self._write_slot(count, c)
+                    count += 1
+                    last_ts = ts
+            header[_COUNT] = count
+        finally:
+            header[_SEQ] += 1  # 짝수: 기록 완료
+
+    def append(self, candle: Dict) -> None:
+        self.extend([candle])
+
+    # ---- reader ----
+    def _copy_range(self, col, start: int, end: int) -> list:
+        a = start % self.capacity
+        b = a + (end - start)
+        if b <= self.capacity:
+            return col[a:b].tolist()
+        return col[a:].tolist() + col[: b - self.capacity].tolist()
+
+    def read(self, limit: Optional[int] = None) -> List[Dict]:
+        """최신 limit개 캔들을 일관된 스냅샷으로 복사 (oldest -> newest)"""
+        header = self.header
+        while True:
+            seq = header[_SEQ]
+            if seq & 1:
+                time.sleep(0)  # writer 기록 중 → 양보 후 재시도
+                continue
+            count = int(header[_COUNT])
+            start = max(0, count - self.capacity)
+            if limit is not None:
+                start = max(start, count - limit)
+            ts = self._copy_range(self.timestamps, start, count)
+            cols = {key: self._copy_range(col, start, count) for key, col in self.columns.items()}
+            if header[_SEQ] == seq:
+                break
+        o, h, l, c, v = (cols[k] for k in _FLOAT_COLUMNS)
+        return [
+            {"timestamp": ts[i], "open": o[i], "high": h[i], "low": l[i], "close": c[i], "volume": v[i]}
+            for i in range(len(ts))
+        ]
+
+    def __len__(self) -> int:
+        return min(int(self.header[_COUNT]), self.capacity)
+
+    def close(self) -> None:
+        self.header.release()
+        self.timestamps.release()
+        for col in self.columns.values():
+            col.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+
+class SharedCandleStore(LiveLoader):
+    """심볼/타임프레임별 SharedCandleBuffer 모음. create=True는 ingest(writer) 측.
+
+    writer는 세그먼트를 항상 새로 생성합니다. 같은 이름의 세그먼트가 남아 있으면
+    (비정상 종료한 이전 writer, 같은 prefix를 쓰는 다른 writer) FileExistsError를 내며,
+    replace=True일 때만 기존 세그먼트를 지우고 다시 만듭니다.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "cobot",
+        create: bool = False,
+        capacity: int = DEFAULT_CAPACITY,
+        replace: bool = False,
+    ):
+        super().__init__(directory="")
+        self.prefix = prefix
+        self.create = create
+        self.capacity = capacity
+        self.replace = replace
+        self.buffers: Dict[Tuple[str, str], SharedCandleBuffer] = {}
+
+    def segment_name(self, symbol: str, timeframe: str) -> str:
+        return f"{self.prefix}_{symbol}_{timeframe}"
+
+    def buffer(self, symbol: str, timeframe: str) -> Optional[SharedCandleBuffer]:
+        """세그먼트 핸들 (한 번 연결/생성하면 캐시).
+
+        reader: 기존 세그먼트에 연결. 없거나 writer가 헤더를 초기화하기 전이면 None을 반환하고
+                캐시하지 않으므로 다음 호출에서 다시 연결을 시도합니다.
+        writer: 아직 기록하지 않은 세그먼트는 None (자기가 만든 세그먼트만 읽음).
+        """
+        buf = self.buffers.get((symbol, timeframe))
+        if buf is not None or self.create:
+            return buf
+        try:
+            buf = SharedCandleBuffer.attach(self.segment_name(symbol, timeframe))
+        except FileNotFoundError:
+            return None
+        if buf is not None:
+            self.buffers[(symbol, timeframe)] = buf
+        return buf
+
+    def _writer_buffer(self, symbol: str, timeframe: str) -> SharedCandleBuffer:
+        key = (symbol, timeframe)
+        buf = self.buffers.get(key)
+        if buf is not None:
+            return buf
+        name = self.segment_name(symbol, timeframe)
+        try:
+            buf = SharedCandleBuffer.create(name, self.capacity)
+        except FileExistsError:
+            if not self.replace:
+                raise FileExistsError(
+                    f"Shared memory segment already exists: {name} "
+                    "(stale segment from a previous writer? use replace=True to recreate)"
+                ) from None
+            _unlink(name)
+            buf = SharedCandleBuffer.create(name, self.capacity)
+        self.buffers[key] = buf
+        return buf
+
+    def append(self, symbol: str, timeframe: str, candle: Dict) -> None:
+        self.extend(symbol, timeframe, [candle])
+
+    def extend(self, symbol: str, timeframe: str, candles: Sequence[Dict]) -> None:
+        if not self.create:
+            raise PermissionError("Read-only SharedCandleStore (create=False)")
+        self._writer_buffer(symbol, timeframe).extend(candles)
+
+    def get_latest(self, symbol: str, limit: int = 100) -> List[Dict]:
+        return self.get_latest_tf(symbol, "5m", limit)
+
+    def get_latest_tf(self, symbol: str, timeframe: str, limit: int = 100) -> List[Dict]:
+        buf = self.buffer(symbol, timeframe)
+        return buf.read(limit) if buf is not None else []
+
+    def load_tf(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> List[Dict]:
+        return self.get_latest_tf(symbol, timeframe, limit if limit is not None else self.capacity)
+
+    def close(self, unlink: bool = False) -> None:
+        for buf in self.buffers.values():
+            buf.close()
+            if unlink and buf.owner:
+                buf.unlink()
+        self.buffers.clear()
+
+
+def ingest_historical(
+    store: SharedCandleStore,
+    historical: HistoricalLoader,
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+) -> Dict[str, Dict[str, int]]:
+    """historical CSV를 공유 메모리로 적재. 반환: {symbol: {tf: 적재 캔들 수}}"""
+    loaded: Dict[str, Dict[str, int]] = {}
+    for symbol in symbols:
+        loaded[symbol] = {}
+        for tf in timeframes:
+            candles = historical.load_tf(symbol, tf, limit=store.capacity)
+            store.extend(symbol, tf, candles)
+            loaded[symbol][tf] = len(candles)
+    return loaded
+
+
+__all__ = [
+    "SharedCandleBuffer",
+    "SharedCandleStore",
+    "ingest_historical",
+]
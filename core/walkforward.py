@@ -0,0 +1,403 @@
+"""Walk-forward 최적화 파이프라인
+
+학습(train) 구간에서 메서드 가중치와 포지션 임계값(`core/position.py`)을 최적화하고,
+바로 다음 검증(test) 구간에서 그 파라미터로 평가하는 과정을 시간축을 따라 반복합니다.
+
+성능 핵심:
+    - 메서드 점수(methods/*)는 파라미터와 무관하므로 심볼마다 한 번만 계산해
+      원시 점수 행렬 {method: {timeframe: [bar별 점수]}}로 캐시 (ScoreCache)
+    - 각 fold는 캐시를 잘라(slice) 사용하고, 후보 파라미터마다 가중 합산 + 시뮬레이션만 수행
+    - 심볼별 캐시 생성과 fold들은 같은 ProcessPoolExecutor로 여러 코어에서 병렬 실행
+      (캐시 워커는 경로만 받아 메서드를 직접 로딩, fold 워커에는 숫자 배열만 전달
+       → 동적 로딩된 메서드 함수를 pickle 할 필요 없음)
+
+점수 캐시는 Backtester.iter_bars로 봉마다 타임프레임별 최근 window개(기본 360, 실시간 main.py와 동일)
+캔들만 넘겨 계산합니다. 전체 이력을 넘기면 봉마다 이력 길이에 비례하는 비용이 들어 캐시 생성이
+O(n^2)이 되므로 (8k 봉 약 3초, 1년치 5m 봉 수십 분), window로 봉당 비용을 고정합니다.
+현재 메서드들은 최근 31개 이하 캔들만 사용하므로 점수는 전체 이력 백테스트와 같습니다.
+window=None이면 전체 이력을 사용합니다.
+
+fold 구성 (시간 기준, driving 타임프레임 봉 수로 지정):
+    |---- train ----|-- test --|
+               |---- train ----|-- test --|     (step = test 기본)
+
+단순화 가정 (Backtester와 동일):
+    - 심볼별 하나의 포지션, 거래 단위 1
+    - 각 구간 시작 시 포지션 없음, 구간 마지막 봉에서 강제 청산
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .backtester import Backtester, _DrawdownTracker
+    from .position import decide_action, BUY_THRESHOLD, SELL_THRESHOLD, STOP_LOSS_PCT
+    from .loader import TIMEFRAME_TO_SECONDS
+except ImportError:
+    import sys as _sys
+    _sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.backtester import Backtester, _DrawdownTracker  # type: ignore
+    from core.position import decide_action, BUY_THRESHOLD, SELL_THRESHOLD, STOP_LOSS_PCT  # type: ignore
+    from core.loader import TIMEFRAME_TO_SECONDS  # type: ignore
+
+NAN = float("nan")
+
+DEFAULT_WEIGHT_GRID = [0.0, 0.5, 1.0]
+DEFAULT_BUY_GRID = [0.2, 0.3, BUY_THRESHOLD]
+DEFAULT_SELL_GRID = [-0.2, -0.3, SELL_THRESHOLD]
+DEFAULT_STOP_GRID = [-0.03, STOP_LOSS_PCT]
+DEFAULT_SCORE_WINDOW = 360  # main.py 실시간 스코어링 윈도우와 동일
+
+
+class ScoreCache:
+    """심볼 1개의 driving 봉별 원시 점수 행렬.
+
+    timestamps/closes : driving 봉의 시각과 종가
+    scores            : {method: {timeframe: [점수 또는 NaN(계산 불가)]}}
+    """
+
+    def __init__(self, symbol: str, methods: Sequence[str], timeframes: Sequence[str]):
+        self.symbol = symbol
+        self.timestamps: List[int] = []
+        self.closes: List[float] = []
+        self.scores: Dict[str, Dict[str, List[float]]] = {m: {tf: [] for tf in timeframes} for m in methods}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, bar: Dict, raw: Dict[str, Dict[str, float]]) -> None:
+        self.timestamps.append(int(bar["timestamp"]))
+        self.closes.append(float(bar["close"]))
+        for method, per_tf in self.scores.items():
+            got = raw.get(method, {})
+            for tf, column in per_tf.items():
+                column.append(got.get(tf, NAN))
+
+    def slice(self, start: int, end: int) -> Dict[str, Any]:
+        """[start, end) 구간을 워커로 보낼 수 있는 순수 데이터 dict로 반환"""
+        return {
+            "symbol": self.symbol,
+            "timestamps": self.timestamps[start:end],
+            "closes": self.closes[start:end],
+            "scores": {m: {tf: col[start:end] for tf, col in per_tf.items()} for m, per_tf in self.scores.items()},
+        }
+
+
+def build_score_cache(bt: Backtester, symbol: str, limit: Optional[int] = None, window: Optional[int] = DEFAULT_SCORE_WINDOW) -> ScoreCache:
+    """메서드 가중치와 무관하게 로딩된 모든 메서드를 타임프레임별로 한 번씩 계산하여 캐시"""
+    methods = list(bt.calc.method_funcs)
+    cache: Optional[ScoreCache] = None
+    for bar, tf_windows in bt.iter_bars(symbol, limit, window):
+        if cache is None:
+            cache = ScoreCache(symbol, methods, list(tf_windows))
+        cache.append(bar, bt.calc.compute_method_tf_scores(symbol, tf_windows))
+    return cache if cache is not None else ScoreCache(symbol, methods, [])
+
+
+def _build_score_cache_task(task: Dict[str, Any]) -> ScoreCache:
+    """워커 프로세스에서 Backtester를 경로로 다시 만들어 심볼 1개의 캐시 생성"""
+    bt = Backtester(task["settings_path"], task["methods_path"], task["historical_dir"])
+    return build_score_cache(bt, task["symbol"], task["limit"], task["window"])
+
+
+def make_folds(start_ts: int, end_ts: int, train_seconds: int, test_seconds: int, step_seconds: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """(train_start, test_start, test_end) 타임스탬프 구간 리스트 (test_end는 미포함).
+
+    end_ts는 데이터 끝(미포함). test 구간이 데이터와 겹치지 않는 fold는 만들지 않으며,
+    마지막 fold의 test 구간은 데이터 끝에서 잘릴 수 있습니다.
+    """
+    step = step_seconds or test_seconds
+    folds: List[Tuple[int, int, int]] = []
+    train_start = start_ts
+    while train_start + train_seconds < end_ts:
+        test_start = train_start + train_seconds
+        test_end = test_start + test_seconds
+        folds.append((train_start, test_start, test_end))
+        train_start += step
+    return folds
+
+
+def _method_series(data: Dict[str, Any], tf_weights: Dict[str, float]) -> Dict[str, List[float]]:
+    """원시 점수 행렬을 타임프레임 가중 평균하여 메서드별 점수 시계열로 변환 (Calculator와 동일 규칙)"""
+    out: Dict[str, List[float]] = {}
+    n = len(data["timestamps"])
+    for method, per_tf in data["scores"].items():
+        series = []
+        for i in range(n):
+            num = 0.0
+            den = 0.0
+            for tf, col in per_tf.items():
+                s = col[i]
+                if math.isnan(s):
+                    continue
+                w_tf = float(tf_weights.get(tf, 1.0))
+                num += s * w_tf
+                den += w_tf
+            series.append(num / den if den > 0 else 0.0)
+        out[method] = series
+    return out
+
+
+def _combined_series(method_series: Dict[str, List[float]], n: int, weights: Dict[str, float]) -> List[float]:
+    total_weight = sum(w for w in weights.values() if w > 0)
+    if total_weight <= 0:
+        return [0.0] * n
+    active = [(method_series.get(m), w) for m, w in weights.items() if w > 0]
+    out = []
+    for i in range(n):
+        acc = 0.0
+        for series, w in active:
+            if series is not None:
+                acc += series[i] * w
+        combined = acc / total_weight
+        if combined > 1:
+            combined = 1.0
+        if combined < -1:
+            combined = -1.0
+        out.append(round(combined, 4))
+    return out
+
+
+def simulate(closes: Sequence[float], scores: Sequence[float], start: int, end: int, params: Dict[str, float]) -> Dict[str, Any]:
+    """[start, end) 구간을 Backtester.run과 같은 규칙으로 시뮬레이션하여 요약 지표 반환"""
+    total_trades = 0
+    wins = 0
+    total_pnl = 0.0
+    drawdown = _DrawdownTracker()
+    position_open = False
+    entry_price: Optional[float] = None
+
+    for i in range(start, end):
+        current_price = closes[i]
+        action = decide_action(
+            scores[i], position_open, entry_price, current_price,
+            buy_threshold=params["buy_threshold"],
+            sell_threshold=params["sell_threshold"],
+            stop_loss_pct=params["stop_loss_pct"],
+        )
+        if not position_open and action == "buy":
+            position_open = True
+            entry_price = current_price
+        elif position_open and action == "sell":
+            pnl = current_price - (entry_price or current_price)
+            total_trades += 1
+            if round(pnl, 4) > 0:
+                wins += 1
+            total_pnl += pnl
+            position_open = False
+            entry_price = None
+        if position_open and entry_price is not None:
+            drawdown.update(total_pnl + current_price - entry_price)
+        else:
+            drawdown.update(total_pnl)
+
+    if position_open and entry_price is not None and end > start:
+        pnl = closes[end - 1] - entry_price
+        total_trades += 1
+        if round(pnl, 4) > 0:
+            wins += 1
+        total_pnl += pnl
+        drawdown.update(total_pnl)
+
+    return {
+        "total_trades": total_trades,
+        "wins": wins,
+        "total_pnl": total_pnl,
+        "max_drawdown": drawdown.max_drawdown,
+    }
+
+
+def _merge_stats(stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total_trades = sum(s["total_trades"] for s in stats)
+    wins = sum(s["wins"] for s in stats)
+    return {
+        "total_trades": total_trades,
+        "win_rate": round(wins / total_trades, 4) if total_trades else 0.0,
+        "total_pnl": round(sum(s["total_pnl"] for s in stats), 4),
+        "max_drawdown": round(min((s["max_drawdown"] for s in stats), default=0.0), 4),
+    }
+
+
+def _run_fold(task: Dict[str, Any]) -> Dict[str, Any]:
+    """fold 1개: train 구간 그리드 탐색 → 최적 파라미터로 test 구간 평가 (워커 프로세스에서 실행)"""
+    tf_weights = task["tf_weights"]
+    prepared = []
+    for data in task["symbols"]:
+        n = len(data["timestamps"])
+        test_idx = bisect_left(data["timestamps"], task["test_start"])
+        prepared.append((data, _method_series(data, tf_weights), n, test_idx))
+
+    best: Optional[Tuple[float, Dict[str, Any], Dict[str, float]]] = None
+    for weights in task["weight_candidates"]:
+        series = [(data, _combined_series(ms, n, weights), n, test_idx) for data, ms, n, test_idx in prepared]
+        for params in task["threshold_candidates"]:
+            stats = [simulate(d["closes"], sc, 0, test_idx, params) for d, sc, n, test_idx in series]
+            train = _merge_stats(stats)
+            objective = train["total_pnl"]
+            if best is None or objective > best[0]:
+                best = (objective, {"method_weights": weights, **params}, train)
+
+    if best is None:
+        return {"train_start": task["train_start"], "test_start": task["test_start"], "test_end": task["test_end"], "params": None}
+    _, best_params, train_stats = best
+    weights = best_params["method_weights"]
+    params = {k: v for k, v in best_params.items() if k != "method_weights"}
+    test_stats = []
+    for data, ms, n, test_idx in prepared:
+        scores = _combined_series(ms, n, weights)
+        test_stats.append(simulate(data["closes"], scores, test_idx, n, params))
+    return {
+        "train_start": task["train_start"],
+        "test_start": task["test_start"],
+        "test_end": task["test_end"],
+        "params": best_params,
+        "train": train_stats,
+        "test": _merge_stats(test_stats),
+        "_test_raw": test_stats,
+    }
+
+
+def weight_candidates(methods: Sequence[str], grid: Sequence[float]) -> List[Dict[str, float]]:
+    """메서드별 가중치 후보의 데카르트 곱 (전부 0인 조합 제외)"""
+    out = []
+    for combo in itertools.product(grid, repeat=len(methods)):
+        if any(w > 0 for w in combo):
+            out.append(dict(zip(methods, combo)))
+    return out
+
+
+def threshold_candidates(buy_grid: Sequence[float], sell_grid: Sequence[float], stop_grid: Sequence[float]) -> List[Dict[str, float]]:
+    return [
+        {"buy_threshold": b, "sell_threshold": s, "stop_loss_pct": sl}
+        for b, s, sl in itertools.product(buy_grid, sell_grid, stop_grid)
+    ]
+
+
+class WalkForward:
+    """Backtester 위에서 동작하는 walk-forward 최적화 드라이버"""
+
+    def __init__(self, backtester: Optional[Backtester] = None, window: Optional[int] = DEFAULT_SCORE_WINDOW):
+        self.bt = backtester or Backtester()
+        self.window = window
+        # (symbol, limit)별 캐시: limit이 다르면 로딩되는 봉 범위가 달라지므로 별도 보관
+        self.caches: Dict[Tuple[str, Optional[int]], ScoreCache] = {}
+
+    def cache_for(self, symbol: str, limit: Optional[int] = None) -> ScoreCache:
+        key = (symbol, limit)
+        if key not in self.caches:
+            self.caches[key] = build_score_cache(self.bt, symbol, limit, self.window)
+        return self.caches[key]
+
+    def build_caches(self, symbols: Sequence[str], limit: Optional[int] = None, pool: Optional[ProcessPoolExecutor] = None) -> List[ScoreCache]:
+        """심볼별 캐시를 준비 (없는 것만 생성). pool이 있으면 심볼 단위로 병렬 생성."""
+        missing = [s for s in dict.fromkeys(symbols) if (s, limit) not in self.caches]
+        if pool is not None and len(missing) > 1:
+            tasks = [{
+                "settings_path": self.bt.calc.settings_path,
+                "methods_path": self.bt.calc.methods_path,
+                "historical_dir": self.bt.loader.directory,
+                "symbol": s,
+                "limit": limit,
+                "window": self.window,
+            } for s in missing]
+            for s, cache in zip(missing, pool.map(_build_score_cache_task, tasks)):
+                self.caches[(s, limit)] = cache
+        return [self.cache_for(s, limit) for s in symbols]
+
+    def run(
+        self,
+        symbols: List[str],
+        train_bars: int,
+        test_bars: int,
+        step_bars: Optional[int] = None,
+        limit: Optional[int] = None,
+        weight_grid: Sequence[float] = DEFAULT_WEIGHT_GRID,
+        buy_grid: Sequence[float] = DEFAULT_BUY_GRID,
+        sell_grid: Sequence[float] = DEFAULT_SELL_GRID,
+        stop_grid: Sequence[float] = DEFAULT_STOP_GRID,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+        try:
+            return self._run(symbols, train_bars, test_bars, step_bars, limit, weight_grid, buy_grid, sell_grid, stop_grid, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _run(
+        self,
+        symbols: List[str],
+        train_bars: int,
+        test_bars: int,
+        step_bars: Optional[int],
+        limit: Optional[int],
+        weight_grid: Sequence[float],
+        buy_grid: Sequence[float],
+        sell_grid: Sequence[float],
+        stop_grid: Sequence[float],
+        pool: Optional[ProcessPoolExecutor],
+    ) -> Dict[str, Any]:
+        caches = [c for c in self.build_caches(symbols, limit, pool) if len(c)]
+        if not caches:
+            return {"folds": [], "test": _merge_stats([])}
+        # driving 타임프레임 봉 간격 (캐시 타임스탬프 간 최소 차이, 없으면 가장 작은 TF)
+        bar_seconds = min(TIMEFRAME_TO_SECONDS.values())
+        for c in caches:
+            diffs = [b - a for a, b in zip(c.timestamps, c.timestamps[1:]) if b > a]
+            if diffs:
+                bar_seconds = min(diffs)
+                break
+        start_ts = min(c.timestamps[0] for c in caches)
+        end_ts = max(c.timestamps[-1] for c in caches) + bar_seconds
+        folds = make_folds(
+            start_ts, end_ts,
+            train_bars * bar_seconds,
+            test_bars * bar_seconds,
+            step_bars * bar_seconds if step_bars else None,
+        )
+
+        methods = list(self.bt.calc.method_funcs)
+        weights = weight_candidates(methods, weight_grid)
+        thresholds = threshold_candidates(buy_grid, sell_grid, stop_grid)
+        tasks = []
+        for train_start, test_start, test_end in folds:
+            sliced = []
+            for c in caches:
+                lo = bisect_left(c.timestamps, train_start)
+                hi = bisect_left(c.timestamps, test_end)
+                if hi > lo:
+                    sliced.append(c.slice(lo, hi))
+            tasks.append({
+                "train_start": train_start,
+                "test_start": test_start,
+                "test_end": test_end,
+                "symbols": sliced,
+                "tf_weights": dict(self.bt.calc.tf_weights),
+                "weight_candidates": weights,
+                "threshold_candidates": thresholds,
+            })
+
+        if pool is None or len(tasks) <= 1:
+            results = [_run_fold(t) for t in tasks]
+        else:
+            results = list(pool.map(_run_fold, tasks))
+
+        test_raw: List[Dict[str, Any]] = []
+        for r in results:
+            test_raw.extend(r.pop("_test_raw", []))
+        return {"folds": results, "test": _merge_stats(test_raw)}
+
+
+__all__ = [
+    "DEFAULT_SCORE_WINDOW",
+    "ScoreCache",
+    "WalkForward",
+    "build_score_cache",
+    "make_folds",
+    "simulate",
+]
@@ -0,0 +1,97 @@
+"""설정/메서드 핫 리로드 감시기
+
+settings.json, timeframes.json, methods/*.py 의 (mtime, size)를 주기적으로 폴링하고
+변경이 감지되면 백그라운드 스레드에서 Calculator.refresh()를 호출합니다.
+refresh는 새 설정 스냅샷을 완성한 뒤 참조만 교체하므로 스코어링 경로는 잠금 없이
+항상 하나의 일관된 스냅샷으로 계산합니다.
+
+재로딩 실패(JSON 문법 오류, 메서드 import 오류 등) 시 기존 스냅샷을 유지하고
+last_error에 예외를 남긴 뒤 다음 변경을 기다립니다.
+
+on_reload 콜백은 새 스냅샷이 적용된 직후 감시 스레드에서 호출됩니다. 변경된 심볼만
+계산하는 루프라면 여기서 전체 심볼을 dirty로 표시해야 새 설정이 바로 반영됩니다.
+
+사용 예:
+    calc = Calculator("config/settings.json", "methods")
+    watcher = ConfigWatcher(calc, interval=1.0, on_reload=lambda: scheduler.mark_all(SYMBOLS, ["5m", "15m"]))
+    watcher.start()
+    ...
+    watcher.stop()
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+try:
+    from .calculator import Calculator
+except ImportError:
+    import sys as _sys
+    _sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from core.calculator import Calculator  # type: ignore
+
+
+class ConfigWatcher:
+    def __init__(self, calc: Calculator, interval: float = 1.0, on_reload: Optional[Callable[[], None]] = None):
+        self.calc = calc
+        self.interval = interval
+        self.on_reload = on_reload
+        self.reloads = 0
+        self.last_error: Optional[BaseException] = None
+        self._fingerprint = self.fingerprint()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def fingerprint(self) -> Tuple:
+        """감시 대상 파일들의 (경로, mtime_ns, size) 튜플. 파일 추가/삭제도 감지."""
+        paths = [self.calc.settings_path, self.calc.timeframes_path]
+        if os.path.isdir(self.calc.methods_path):
+            for fname in sorted(os.listdir(self.calc.methods_path)):
+                if fname.endswith(".py") and not fname.startswith("__"):
+                    paths.append(os.path.join(self.calc.methods_path, fname))
+        entries = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                entries.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                entries.append((path, None, None))
+        return tuple(entries)
+
+    def check(self) -> bool:
+        """변경 여부를 한 번 확인하고 변경 시 재로딩. 새 스냅샷이 적용되면 True."""
+        current = self.fingerprint()
+        if current == self._fingerprint:
+            return False
+        self._fingerprint = current
+        try:
+            self.calc.refresh()
+        except Exception as exc:  # 기존 스냅샷 유지
+            self.last_error = exc
+            return False
+        self.last_error = None
+        self.reloads += 1
+        if self.on_reload is not None:
+            self.on_reload()
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+__all__ = ["ConfigWatcher"]
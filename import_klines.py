@@ -0,0 +1,34 @@
+"""Binance Kline Importer
+
+data.binance.vision kline 덤프(zip/csv)를 data/historical/<tf>/<SYMBOL>.csv 로 변환합니다.
+
+Usage example:
+    python import_klines.py downloads/BTCUSDT-5m-2024-*.zip --strip-quote USDT
+    python import_klines.py downloads/*.zip --out data/historical --no-merge
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+from core.importer import import_dumps
+from core.loader import HISTORICAL_DIR
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Import Binance kline dumps into data/historical")
+    p.add_argument("paths", nargs="+", help="Kline dump files (.zip or .csv, glob patterns allowed)")
+    p.add_argument("--out", type=str, default=HISTORICAL_DIR, help="Output historical directory")
+    p.add_argument("--strip-quote", type=str, default=None, help="Quote asset suffix to strip (e.g. USDT)")
+    p.add_argument("--no-merge", action="store_true", help="Overwrite existing CSVs instead of merging")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    paths = []
+    for pattern in args.paths:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    report = import_dumps(paths, out_dir=args.out, strip_quote=args.strip_quote, merge=not args.no_merge)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
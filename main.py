@@ -6,15 +6,25 @@
     - 각 업데이트마다 Calculator + Position 로직 호출 → JSON 출력
 
 현재는 데모를 위해 historical 데이터를 live 데이터 대용으로 사용합니다.
+
+사용 예:
+    python main.py                  # 전체 결과를 하나의 JSON으로 출력
+    python main.py --format ndjson  # 심볼별 결과를 계산 즉시 한 줄씩 출력
+    python main.py --loop 1         # 1초마다 새 캔들 확인 → 변경된 심볼만 계산 (설정 변경 시 자동 재로딩)
 """
 from __future__ import annotations
 
+import argparse
 import json
 import os
-from typing import Dict, List
+import sys
+from typing import Dict, Iterator, List, Optional
 from core.calculator import Calculator
-from core.loader import HistoricalLoader, LiveLoader, get_multi_timeframe_candles
+from core.loader import HistoricalLoader, LiveLoader, align_to_latest, get_multi_timeframe_candles
+from core.output import NDJSONWriter
 from core.position import build_output
+from core.scheduler import FileChangeDetector, ScoringScheduler
+from core.watcher import ConfigWatcher
 
 SYMBOLS = ["BTC", "ETH"]
 
@@ -26,37 +36,90 @@ positions = {
 
 def get_tf_candles(symbol: str, historical: HistoricalLoader, live: LiveLoader, window: int = 300):
     # 타임프레임별 실제 데이터가 있으면 직접 사용, 없으면 가장 작은 TF에서 리샘플
-    return get_multi_timeframe_candles(
+    tf_candles = get_multi_timeframe_candles(
         symbol=symbol,
         historical=historical,
         live=live,
         timeframes=["5m", "15m"],
         window=window,
     )
+    # 최신 5m 봉 종가 시점에 아직 진행 중인 15m 캔들은 제외 (백테스트와 동일한 기준)
+    return align_to_latest(tf_candles, "5m")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def make_calculator() -> Calculator:
+    return Calculator(os.path.join(BASE_DIR, "config", "settings.json"), os.path.join(BASE_DIR, "methods"))
 
-def run_once() -> Dict:
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    settings_path = os.path.join(base_dir, "config", "settings.json")
-    methods_path = os.path.join(base_dir, "methods")
-    historical_dir = os.path.join(base_dir, "data", "historical")
-    live_dir = os.path.join(base_dir, "data", "live")
+def has_position(symbol: str) -> bool:
+    return bool(positions.get(symbol, {}).get("has_position", False))
 
-    calc = Calculator(settings_path, methods_path)
+def iter_outputs(calc: Optional[Calculator] = None, symbols: Optional[List[str]] = None) -> Iterator[Dict]:
+    """심볼별 build_output 결과를 계산되는 즉시 하나씩 yield (symbols 미지정 시 SYMBOLS 전체)"""
+    historical_dir = os.path.join(BASE_DIR, "data", "historical")
+    live_dir = os.path.join(BASE_DIR, "data", "live")
+
+    if calc is None:
+        calc = make_calculator()
+    config = calc.snapshot()  # 이번 틱의 모든 심볼은 같은 설정 스냅샷으로 계산
     historical = HistoricalLoader(historical_dir)
     live = LiveLoader(live_dir)
-    result: Dict = {}
-    for symbol in SYMBOLS:
+    for symbol in (SYMBOLS if symbols is None else symbols):
         tf_candles = get_tf_candles(symbol, historical, live, window=360)  # 5m 기준 360개 ≈ 30시간
         base_5m = tf_candles.get("5m", [])
         if not base_5m:
             continue
-        score = calc.compute_symbol_multiTF(symbol, tf_candles)
+        score = calc.compute_symbol_multiTF(symbol, tf_candles, config=config)
         current_price = base_5m[-1]["close"]
         p_state = positions.get(symbol, {"has_position": False, "entry_price": None})
-        out = build_output(symbol, score, p_state["has_position"], p_state["entry_price"], current_price)
+        yield build_output(symbol, score, p_state["has_position"], p_state["entry_price"], current_price)
+
+def run_once(calc: Optional[Calculator] = None, symbols: Optional[List[str]] = None) -> Dict:
+    result: Dict = {}
+    for out in iter_outputs(calc, symbols):
         result.update(out)
     return result
 
+def emit(fmt: str, calc: Optional[Calculator] = None, symbols: Optional[List[str]] = None) -> None:
+    if fmt == "ndjson":
+        writer = NDJSONWriter(sys.stdout)
+        for out in iter_outputs(calc, symbols):
+            writer.write(out)
+    else:
+        data = run_once(calc, symbols)
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run live (demo) scoring")
+    p.add_argument("--format", choices=["json", "ndjson"], default="json", help="Output format")
+    p.add_argument("--loop", type=float, default=None, help="Poll for new candles every N seconds and score only changed symbols")
+    return p.parse_args()
+
 if __name__ == "__main__":  # pragma: no cover
-    data = run_once()
-    print(json.dumps(data, ensure_ascii=False, indent=2))
+    args = parse_args()
+    if args.loop is None:
+        emit(args.format)
+    else:
+        calc = make_calculator()
+        timeframes = ["5m", "15m"]
+        scheduler = ScoringScheduler()
+        # 설정이 바뀌면 새 캔들이 없어도 전체 심볼을 다시 계산
+        watcher = ConfigWatcher(calc, on_reload=lambda: scheduler.mark_all(SYMBOLS, timeframes)).start()
+        detector = FileChangeDetector(
+            scheduler,
+            SYMBOLS,
+            timeframes,
+            historical=HistoricalLoader(os.path.join(BASE_DIR, "data", "historical")),
+            live=LiveLoader(os.path.join(BASE_DIR, "data", "live")),
+            interval=args.loop,
+        ).start()
+        try:
+            while True:
+                batch = scheduler.next_batch(priority=has_position, timeout=args.loop)
+                if batch:
+                    emit(args.format, calc, [symbol for symbol, _ in batch])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            detector.stop()
+            watcher.stop()
@@ -0,0 +1,40 @@
+"""Market Replay Runner (실시간 경로 부하/지연시간 테스트)
+
+Usage example:
+    python replay.py --symbols BTC,ETH                      # 최대 속도, 원본 심볼 그대로
+    python replay.py --symbols BTC,ETH --synthetic 500      # 합성 심볼 500개
+    python replay.py --synthetic 500 --speed 60             # 60배속 (5m 봉 → 5초마다 1틱)
+    python replay.py --synthetic 500 --budget 60            # 1m 봉 기준(60초) 예산으로 headroom 판단
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from core.calculator import Calculator
+from core.loader import HistoricalLoader
+from core.replay import ReplayEngine, ReplayFeed
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Replay historical candles through the live pipeline")
+    p.add_argument("--symbols", type=str, default="BTC,ETH", help="Comma separated source symbols")
+    p.add_argument("--synthetic", type=int, default=None, help="Number of synthetic symbols (cycled over sources)")
+    p.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, 1 = wall-clock, N = N x speed")
+    p.add_argument("--ticks", type=int, default=None, help="Max ticks to replay")
+    p.add_argument("--window", type=int, default=360, help="Candles per timeframe passed to methods")
+    p.add_argument("--budget", type=float, default=None, help="Per-tick latency budget in seconds (default: bar interval / speed)")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    calc = Calculator(os.path.join(base_dir, "config", "settings.json"), os.path.join(base_dir, "methods"))
+    historical = HistoricalLoader(os.path.join(base_dir, "data", "historical"))
+    sources = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    feed = ReplayFeed(historical, sources, timeframes=["5m", "15m"], n_symbols=args.synthetic)
+    engine = ReplayEngine(calc, feed, window=args.window)
+    result = engine.run(speed=args.speed, max_ticks=args.ticks, budget_seconds=args.budget)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
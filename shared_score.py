@@ -0,0 +1,72 @@
+"""Shared-memory Scoring Runner
+
+ingest(현재 프로세스)가 캔들을 공유 메모리에 한 번 적재하고, N개의 워커 프로세스가
+각자 심볼 일부를 맡아 공유 메모리에서 직접 읽어 점수를 계산합니다.
+
+Usage example:
+    python shared_score.py --symbols BTC,ETH --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from core.calculator import Calculator
+from core.loader import HistoricalLoader, align_to_latest, get_multi_timeframe_candles
+from core.position import build_output
+from core.shm_store import SharedCandleStore, ingest_historical
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TIMEFRAMES = ["5m", "15m"]
+
+def score_shard(prefix: str, symbols: List[str], window: int) -> Dict:
+    calc = Calculator(os.path.join(BASE_DIR, "config", "settings.json"), os.path.join(BASE_DIR, "methods"))
+    store = SharedCandleStore(prefix)
+    result: Dict = {}
+    try:
+        for symbol in symbols:
+            tf_candles = align_to_latest(get_multi_timeframe_candles(
+                symbol=symbol,
+                historical=store,  # type: ignore[arg-type]
+                live=store,
+                timeframes=TIMEFRAMES,
+                window=window,
+            ), "5m")
+            base = tf_candles.get("5m", [])
+            if not base:
+                continue
+            score = calc.compute_symbol_multiTF(symbol, tf_candles)
+            result.update(build_output(symbol, score, False, None, base[-1]["close"]))
+    finally:
+        store.close()
+    return result
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Score symbols from a shared-memory candle store")
+    p.add_argument("--symbols", type=str, default="BTC,ETH", help="Comma separated symbols")
+    p.add_argument("--workers", type=int, default=2, help="Scoring worker processes")
+    p.add_argument("--window", type=int, default=360, help="Candles per timeframe")
+    p.add_argument("--prefix", type=str, default=f"cobot{os.getpid()}", help="Shared memory segment prefix")
+    p.add_argument("--replace", action="store_true", help="Unlink and recreate segments left behind with the same prefix")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    store = SharedCandleStore(args.prefix, create=True, replace=args.replace)
+    try:
+        ingest_historical(store, HistoricalLoader(os.path.join(BASE_DIR, "data", "historical")), symbols, TIMEFRAMES)
+        shards = [symbols[i::args.workers] for i in range(args.workers)]
+        result: Dict = {}
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(score_shard, args.prefix, shard, args.window) for shard in shards if shard]
+            for fut in futures:
+                result.update(fut.result())
+    finally:
+        store.close(unlink=True)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Walk-forward Runner
+
+Usage example:
+    python walkforward.py --symbols BTC,ETH --train 12 --test 4
+    python walkforward.py --symbols BTC,ETH --train 2000 --test 500 --workers 8 --weights 0,0.5,1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from core.walkforward import (
+    WalkForward,
+    DEFAULT_WEIGHT_GRID,
+    DEFAULT_BUY_GRID,
+    DEFAULT_SELL_GRID,
+    DEFAULT_STOP_GRID,
+    DEFAULT_SCORE_WINDOW,
+)
+
+def _floats(text: str):
+    return [float(x) for x in text.split(",") if x.strip()]
+
+def _csv(values) -> str:
+    return ",".join(str(v) for v in values)
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run walk-forward optimization")
+    p.add_argument("--symbols", type=str, default="BTC,ETH", help="Comma separated symbols")
+    p.add_argument("--limit", type=int, default=None, help="Max candles per symbol")
+    p.add_argument("--train", type=int, required=True, help="Train window size (driving timeframe bars)")
+    p.add_argument("--test", type=int, required=True, help="Test window size (driving timeframe bars)")
+    p.add_argument("--step", type=int, default=None, help="Fold step (bars, default: --test)")
+    p.add_argument("--window", type=int, default=DEFAULT_SCORE_WINDOW, help="Candles per timeframe passed to methods at each bar (0: full history)")
+    p.add_argument("--workers", type=int, default=None, help="Parallel worker processes (default: CPU count)")
+    p.add_argument("--weights", type=str, default=_csv(DEFAULT_WEIGHT_GRID), help="Method weight grid")
+    p.add_argument("--buy", type=str, default=_csv(DEFAULT_BUY_GRID), help="BUY_THRESHOLD grid")
+    p.add_argument("--sell", type=str, default=_csv(DEFAULT_SELL_GRID), help="SELL_THRESHOLD grid")
+    p.add_argument("--stop", type=str, default=_csv(DEFAULT_STOP_GRID), help="STOP_LOSS_PCT grid")
+    return p.parse_args()
+
+def main():
+    args = parse_args()
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    result = WalkForward(window=args.window or None).run(
+        symbols,
+        train_bars=args.train,
+        test_bars=args.test,
+        step_bars=args.step,
+        limit=args.limit,
+        weight_grid=_floats(args.weights),
+        buy_grid=_floats(args.buy),
+        sell_grid=_floats(args.sell),
+        stop_grid=_floats(args.stop),
+        workers=args.workers,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()